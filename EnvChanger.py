@@ -2,19 +2,51 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import yaml
 import os
+import mmap
 import subprocess
+import functools
+
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 ##############################
 #  STEALTH WINDOW FUNCTIONS  #
 ##############################
+# Enter/Leave fire for every child widget the mouse crosses, so the visibility
+# check is debounced: only the last crossing within this window is handled.
+ALPHA_DEBOUNCE_MS = 50
+_alpha_job = None
+
+def _schedule_alpha_check(callback):
+    """Run callback after ALPHA_DEBOUNCE_MS, replacing any check still pending."""
+    global _alpha_job
+    if _alpha_job is not None:
+        root.after_cancel(_alpha_job)
+    _alpha_job = root.after(ALPHA_DEBOUNCE_MS, callback)
+
 def on_enter(event):
     """Mouse enters the main window area."""
+    _schedule_alpha_check(_show_window)
+
+def on_leave(event):
+    """Mouse leaves the main window area."""
+    _schedule_alpha_check(_hide_window)
+
+def _show_window():
+    """Debounced body of on_enter: show unless a combobox has focus."""
+    global _alpha_job
+    _alpha_job = None
     # If user is not in the middle of using a dropdown, show fully.
     if not is_in_combobox_focus():
         root.attributes("-alpha", 1.0)
 
-def on_leave(event):
-    """Mouse leaves the main window area."""
+def _hide_window():
+    """Debounced body of on_leave: hide unless a combobox has focus."""
+    global _alpha_job
+    _alpha_job = None
     # If the focus is still on one of our comboboxes or its popup, do not hide yet.
     if not is_in_combobox_focus():
         root.attributes("-alpha", 0.01)
@@ -87,36 +119,112 @@ def move_to_top_left(root, window_width=300, window_height=180, x_offset=25, y_o
     y = 0 + y_offset
     root.geometry(f"{window_width}x{window_height}+{x}+{y}")
 
+##############################
+#          WIDGETS           #
+##############################
+def make_row(parent, row, label, values=()):
+    """Add a label + readonly combobox row to the grid and return (variable, combobox)."""
+    tk.Label(parent, text=label, bg="lightgray").grid(row=row, column=0, padx=10, pady=10, sticky="e")
+    var = tk.StringVar()
+    combobox = ttk.Combobox(parent, textvariable=var, state="readonly", values=values)
+    combobox.grid(row=row, column=1, padx=10, pady=10)
+    return var, combobox
+
 ##############################
 #       YAML + LOGIC         #
 ##############################
+CONFIG_FILE = "Config.yaml"
+
+# Parsed YAML keyed by path, stored as (mtime, data) so edits are picked up.
+_YAML_CACHE = {}
+
+def load_yaml(path):
+    """Load a YAML file, reusing the parsed result while the file is unchanged."""
+    st = os.stat(path)
+    mtime = st.st_mtime
+    hit = _YAML_CACHE.get(path)
+    if hit and hit[0] == mtime:
+        return hit[1]
+    if st.st_size == 0:
+        # mmap cannot map an empty file; an empty document parses to None.
+        data = None
+    else:
+        # Map the file so the parser reads it straight from memory.
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = yaml.load(mm, Loader=_Loader)
+    _YAML_CACHE[path] = (mtime, data)
+    return data
+
 def load_config():
     """Load configuration file."""
-    with open("Config.yaml", "r", encoding="utf-8") as file:
-        return yaml.safe_load(file)
-
-def get_customer_environments(config, customer_name):
-    """Get environments for a specific customer."""
-    for customer in config['customers']:
-        if customer['name'] == customer_name:
-            return customer['environments']
-    return []
-
-def get_environment_version(config, customer_name, environment_name):
+    return load_yaml(CONFIG_FILE)
+
+def build_index(config):
+    """Index the config as customer -> environment name -> environment entry."""
+    return {
+        customer['name']: {env['name']: env for env in customer['environments']}
+        for customer in config['customers']
+    }
+
+def load_tables():
+    """Load the config and build the (INDEX, ENVIRONMENT_NAMES) lookup tables."""
+    index = build_index(load_config())
+    environment_names = {customer: tuple(environments) for customer, environments in index.items()}
+    return index, environment_names
+
+def get_major_version(version):
+    """Get the major component of a dotted version string, e.g. "23" for "23.1.1.3"."""
+    return version.split('.', 1)[0]
+
+def get_customer_environments(index, customer_name):
+    """Get environments (name -> entry) for a specific customer."""
+    return index.get(customer_name, {})
+
+def get_environment_version(index, customer_name, environment_name):
     """Get version for a specific environment."""
-    environments = get_customer_environments(config, customer_name)
-    for env in environments:
-        if env['name'] == environment_name:
-            return env['version']
-    return None
+    return get_customer_environments(index, customer_name).get(environment_name, {}).get('version')
 
-def get_environment_attributes(config, customer_name, environment_name):
+def get_environment_attributes(index, customer_name, environment_name):
     """Get attributes for a specific environment."""
-    environments = get_customer_environments(config, customer_name)
-    for env in environments:
-        if env['name'] == environment_name:
-            return env['attributes']
-    return {}
+    return get_customer_environments(index, customer_name).get(environment_name, {}).get('attributes') or {}
+
+SCRIPT_TYPES = ("Workstation", "Interface", "Service")
+
+# Script parameters per (type, major version), as (parameter, attribute, optional).
+# "*" matches any major version. Optional parameters are omitted when empty.
+SCRIPT_PARAMETERS = {
+    ("Workstation", "23"): [("AppService", "appservice", False), ("InstallPath", "install_path", True)],
+    ("Workstation", "5"): [("QDrive", "qdrive", False)],
+    ("Interface", "*"): [("QDrive", "qdrive", False)],
+    ("Service", "*"): [("QDrive", "qdrive", False)],
+}
+
+def get_script_parameters(type_, major_version):
+    """Get the script parameters for a type and major version, or None if none are defined."""
+    return SCRIPT_PARAMETERS.get((type_, major_version)) or SCRIPT_PARAMETERS.get((type_, "*"))
+
+PS_FILE_PREFIX = ("powershell", "-NoProfile", "-NonInteractive", "-File")
+
+@functools.lru_cache(maxsize=128)
+def build_ps_command(customer, environment, type_):
+    """
+    Build the PowerShell command line for a customer/environment/type selection.
+    Reads INDEX, so the cache must be cleared whenever INDEX is rebuilt.
+    """
+    attributes = get_environment_attributes(INDEX, customer, environment)
+    major_version = get_major_version(get_environment_version(INDEX, customer, environment))
+    params = get_script_parameters(type_, major_version)
+
+    ps_command = [
+        *PS_FILE_PREFIX, f"{major_version}_{type_}.ps1",
+        "-CustomerName", customer,
+        "-Environment", environment,
+    ]
+    for param, attribute, optional in params:
+        value = attributes.get(attribute, '')
+        if value or not optional:
+            ps_command += [f"-{param}", value]
+    return tuple(ps_command)
 
 def on_change():
     """Handle change button click."""
@@ -128,92 +236,65 @@ def on_change():
         messagebox.showerror("Error", "Please select all options!")
         return
 
-    # Get version and attributes
-    version = get_environment_version(config, selected_customer, selected_environment)
-    attributes = get_environment_attributes(config, selected_customer, selected_environment)
+    version = get_environment_version(INDEX, selected_customer, selected_environment)
 
     if not version:
         messagebox.showerror("Error", "Version not found!")
         return
 
-    major_version = version.split('.')[0]
+    major_version = get_major_version(version)
     script_name = f"{major_version}_{selected_type}.ps1"
 
-    if os.path.exists(script_name):
-        try:
-            # Execute the script using PowerShell with parameters
-            if selected_type == "Workstation":
-                if major_version == "23":
-                    if attributes.get('install_path', '') == "":
-                        appservice = attributes.get('appservice', '')
-                        ps_command = [
-                        "powershell",
-                        "-File", script_name,
-                        "-CustomerName", selected_customer,
-                        "-Environment", selected_environment,
-                        "-AppService", appservice,
-                    ]
-                    else:
-                        appservice = attributes.get('appservice', '')
-                        install_path = attributes.get('install_path', '')
-
-                        ps_command = [
-                        "powershell",
-                        "-File", script_name,
-                        "-CustomerName", selected_customer,
-                        "-Environment", selected_environment,
-                        "-AppService", appservice,
-                        "-InstallPath", install_path
-                        ]
-                elif major_version == "5":
-                    qdrive = attributes.get('qdrive', '')
-
-                    ps_command = [
-                    "powershell",
-                    "-File", script_name,
-                    "-CustomerName", selected_customer,
-                    "-Environment", selected_environment,
-                    "-QDrive", qdrive
-                    ]
-            elif selected_type == "Interface":
-                qdrive = attributes.get('qdrive', '')
-                ps_command = [
-                    "powershell",
-                    "-File", script_name,
-                    "-CustomerName", selected_customer,
-                    "-Environment", selected_environment,
-                    "-QDrive", qdrive
-                ]
-            elif selected_type == "Service":
-                qdrive = attributes.get('qdrive', '')
-                ps_command = [
-                    "powershell",
-                    "-File", script_name,
-                    "-CustomerName", selected_customer,
-                    "-Environment", selected_environment,
-                    "-QDrive", qdrive
-                ]
-            subprocess.run(ps_command, check=True)
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("Error", f"Error running script: {e}")
-    else:
+    if not os.path.exists(script_name):
         messagebox.showerror("Error", f"Script not found: {script_name}")
+        return
 
-def populate_environment_dropdown(event):
-    """Update environments when customer is selected."""
-    selected_customer = customer_var.get()
-    if not selected_customer:
+    if get_script_parameters(selected_type, major_version) is None:
+        messagebox.showerror("Error", f"No script parameters defined for {selected_type} {major_version}.x")
         return
 
-    environments = [env['name'] for env in get_customer_environments(config, selected_customer)]
-    environment_dropdown["values"] = environments
+    try:
+        # Execute the script using PowerShell with parameters
+        ps_command = build_ps_command(selected_customer, selected_environment, selected_type)
+        subprocess.run(list(ps_command), check=True)
+    except subprocess.CalledProcessError as e:
+        messagebox.showerror("Error", f"Error running script: {e}")
+
+def populate_environment_dropdown():
+    """Fill the environment list for the selected customer just before it opens."""
+    environment_dropdown["values"] = ENVIRONMENT_NAMES.get(customer_var.get(), ())
+
+def on_customer_selected(event):
+    """Clear the environment selection and list when a customer is selected."""
+    # Reset the values too, or the mouse wheel can cycle through the previous
+    # customer's environments before the list is next posted.
+    environment_dropdown["values"] = ()
     environment_var.set("")
 
+def reload_config(event=None):
+    """Re-read the config file and refresh the dropdowns (bound to F5)."""
+    global INDEX, ENVIRONMENT_NAMES
+    try:
+        INDEX, ENVIRONMENT_NAMES = load_tables()
+    except (OSError, yaml.YAMLError, KeyError, TypeError) as e:
+        messagebox.showerror("Error", f"Error reloading {CONFIG_FILE}: {e}")
+        return
+    build_ps_command.cache_clear()
+
+    # Keep the current selections where they still exist in the new config
+    customer_dropdown["values"] = tuple(INDEX)
+    if customer_var.get() not in INDEX:
+        customer_var.set("")
+    environment_dropdown["values"] = ()
+    if environment_var.get() not in ENVIRONMENT_NAMES.get(customer_var.get(), ()):
+        environment_var.set("")
+
 #################################
 #           MAIN APP            #
 #################################
 if __name__ == "__main__":
-    config = load_config()
+    # Preload the lookup tables once so dropdown events never touch the config list.
+    INDEX, ENVIRONMENT_NAMES = load_tables()
 
     root = tk.Tk()
     root.title("Customer Environment Selector")
@@ -232,6 +313,9 @@ if __name__ == "__main__":
     root.bind("<Enter>", on_enter)
     root.bind("<Leave>", on_leave)
 
+    # F5 reloads the config so edits show up without restarting
+    root.bind("<F5>", reload_config)
+
     #
     # CUSTOM TITLE BAR
     #
@@ -259,28 +343,17 @@ if __name__ == "__main__":
     main_frame.pack(fill="both", expand=True)
 
     # UI Layout
-    tk.Label(main_frame, text="Customer:", bg="lightgray").grid(row=0, column=0, padx=10, pady=10, sticky="e")
-    customer_var = tk.StringVar()
-    customer_dropdown = ttk.Combobox(main_frame, textvariable=customer_var, state="readonly")
-    customer_dropdown["values"] = [customer['name'] for customer in config['customers']]
-    customer_dropdown.grid(row=0, column=1, padx=10, pady=10)
-
-    tk.Label(main_frame, text="Environment:", bg="lightgray").grid(row=1, column=0, padx=10, pady=10, sticky="e")
-    environment_var = tk.StringVar()
-    environment_dropdown = ttk.Combobox(main_frame, textvariable=environment_var, state="readonly")
-    environment_dropdown.grid(row=1, column=1, padx=10, pady=10)
-
-    tk.Label(main_frame, text="Type:", bg="lightgray").grid(row=2, column=0, padx=10, pady=10, sticky="e")
-    type_var = tk.StringVar()
-    type_dropdown = ttk.Combobox(main_frame, textvariable=type_var, state="readonly")
-    type_dropdown["values"] = ["Workstation", "Interface", "Service"]
-    type_dropdown.grid(row=2, column=1, padx=10, pady=10)
+    customer_var, customer_dropdown = make_row(main_frame, 0, "Customer:", values=tuple(INDEX))
+    environment_var, environment_dropdown = make_row(main_frame, 1, "Environment:")
+    type_var, type_dropdown = make_row(main_frame, 2, "Type:", values=SCRIPT_TYPES)
 
     change_button = ttk.Button(main_frame, text="Change", command=on_change)
     change_button.grid(row=3, column=0, columnspan=2, pady=20)
 
-    # When a customer is selected, update environment dropdown
-    customer_dropdown.bind("<<ComboboxSelected>>", populate_environment_dropdown)
+    # Environments are filled when the dropdown opens; selecting a customer only
+    # clears the previous environment selection
+    environment_dropdown.configure(postcommand=populate_environment_dropdown)
+    customer_dropdown.bind("<<ComboboxSelected>>", on_customer_selected)
 
     # Ensure the window remains visible if user opens a dropdown
     # (bind combobox focus events)